@@ -1,6 +1,12 @@
 """Software factory package powered by the Microsoft Agent Framework."""
 
-from .client import apply_model_config, get_chat_client, get_model_config, ModelConfig
+from .client import (
+	apply_model_config,
+	get_chat_client,
+	get_model_config,
+	invalidate_model_cache,
+	ModelConfig,
+)
 from .workflow import build_workflow
 
 __all__ = [
@@ -8,5 +14,6 @@ __all__ = [
 	"build_workflow",
 	"get_chat_client",
 	"get_model_config",
+	"invalidate_model_cache",
 	"ModelConfig",
 ]
@@ -2,10 +2,17 @@
 
 import argparse
 import asyncio
+import logging
 import os
+import re
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, NoReturn, Optional
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
 
 from agent_framework._workflows._events import (
     AgentRunEvent,
@@ -17,29 +24,51 @@ from agent_framework._workflows._events import (
 )
 
 from . import build_workflow, get_chat_client
-from .client import MissingAPIKeyError, get_model_config
+from .client import MissingAPIKeyError, get_model_config, invalidate_model_cache
+
+
+_ENV_RE = re.compile(
+    r"""^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    # A bare "#" only starts a comment after whitespace, so "abc#123" stays intact.
+    r"""(?:"([^"\n]*)"|'([^'\n]*)'|((?:[^\r\n#]|(?<![ \t])#)*))""",
+    re.MULTILINE,
+)
 
 
 def _load_env_file(env_path: Path) -> None:
     """Populate os.environ from a .env file if present without overriding existing vars."""
 
-    if not env_path.exists():
+    try:
+        if env_path.stat().st_size == 0:
+            return
+    except FileNotFoundError:
         return
 
-    for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if line.startswith("export "):
-            line = line[len("export ") :]
-        key, sep, value = line.partition("=")
-        if not sep:
-            continue
-        key = key.strip()
-        if not key or key in os.environ:
-            continue
-        normalized = value.strip().strip('"').strip("'")
-        os.environ[key] = normalized
+    data = env_path.read_bytes().decode("utf-8", "replace")
+    parsed: dict[str, str] = {}
+    for match in _ENV_RE.finditer(data):
+        key, double_quoted, single_quoted, bare = match.groups()
+        if double_quoted is not None:
+            value = double_quoted
+        elif single_quoted is not None:
+            value = single_quoted
+        else:
+            value = bare.strip()
+        parsed.setdefault(key, value)
+    os.environ.update({key: value for key, value in parsed.items() if key not in os.environ})
+
+
+def _configure_logging() -> None:
+    """Route package log records to stdout once per process."""
+
+    logger = logging.getLogger("software_factory")
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[software-factory] %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
 
 def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -76,34 +105,79 @@ async def _run_workflow(prompt: str, model: Optional[str], debug: bool) -> str:
 
     final_output: str = ""
     async for event in workflow.run_stream(prompt):
-        if isinstance(event, WorkflowOutputEvent):
-            final_output = str(event.data)
-            print(f"[workflow-output:{event.source_executor_id}]\n{final_output}\n")
-        elif isinstance(event, WorkflowFailedEvent):
-            details = event.details
-            raise RuntimeError(
-                f"Workflow failed in executor {details.executor_id}: {details.error_type}: {details.message}"
-            )
+        event_handler = _lookup_handler(_RUN_HANDLERS, type(event), None)
+        if event_handler is not None:
+            final_output = event_handler(event)
         elif debug:
             _debug_print(event)
 
     return final_output
 
 
-def _debug_print(event) -> None:  # pragma: no cover - debug helper
-    if isinstance(event, WorkflowStatusEvent):
-        message = f"state={event.state.value}"
-    elif isinstance(event, WorkflowWarningEvent):
-        message = f"warning={event.data}"
-    elif isinstance(event, AgentRunUpdateEvent):
-        chunk = getattr(event.data, "delta", None)
-        message = f"token={getattr(chunk, 'content', '')!r} executor={event.executor_id}"
-    elif isinstance(event, AgentRunEvent):
-        message = f"response executor={event.executor_id}"
-    else:
-        payload = getattr(event, "data", None)
-        message = f"data={payload!r}"
+def _lookup_handler(table: dict[type, Any], event_type: type, default: Any) -> Any:
+    """Resolve a handler by exact event type, memoizing subclass fallbacks."""
+
+    try:
+        return table[event_type]
+    except KeyError:
+        pass
+    resolved = next((table[base] for base in event_type.__mro__ if base in table), default)
+    table[event_type] = resolved
+    return resolved
+
+
+def _on_output(event: WorkflowOutputEvent) -> str:
+    final_output = str(event.data)
+    sys.stdout.writelines(("[workflow-output:", event.source_executor_id, "]\n", final_output, "\n\n"))
+    sys.stdout.flush()
+    return final_output
+
+
+def _on_failed(event: WorkflowFailedEvent) -> NoReturn:
+    details = event.details
+    raise RuntimeError(
+        f"Workflow failed in executor {details.executor_id}: {details.error_type}: {details.message}"
+    )
+
+
+_RUN_HANDLERS: dict[type, Callable[[Any], str] | None] = {
+    WorkflowOutputEvent: _on_output,
+    WorkflowFailedEvent: _on_failed,
+}
 
+
+def _format_status(event: WorkflowStatusEvent) -> str:
+    return f"state={event.state.value}"
+
+
+def _format_warning(event: WorkflowWarningEvent) -> str:
+    return f"warning={event.data}"
+
+
+def _format_update(event: AgentRunUpdateEvent) -> str:
+    chunk = getattr(event.data, "delta", None)
+    return f"token={getattr(chunk, 'content', '')!r} executor={event.executor_id}"
+
+
+def _format_response(event: AgentRunEvent) -> str:
+    return f"response executor={event.executor_id}"
+
+
+def _format_default(event: Any) -> str:
+    payload = getattr(event, "data", None)
+    return f"data={payload!r}"
+
+
+_DEBUG_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    WorkflowStatusEvent: _format_status,
+    WorkflowWarningEvent: _format_warning,
+    AgentRunUpdateEvent: _format_update,
+    AgentRunEvent: _format_response,
+}
+
+
+def _debug_print(event) -> None:  # pragma: no cover - debug helper
+    message = _lookup_handler(_DEBUG_FORMATTERS, type(event), _format_default)(event)
     sys.stderr.write(f"[DEBUG][{event.__class__.__name__}] {message}\n")
 
 
@@ -117,11 +191,15 @@ def _load_prompt(args: argparse.Namespace) -> str:
 
 def main(argv: Optional[list[str]] = None) -> int:
     _load_env_file(Path(".env"))
+    invalidate_model_cache()
+    _configure_logging()
     args = _parse_args(argv)
 
     try:
         prompt = _load_prompt(args)
-        final_output = asyncio.run(_run_workflow(prompt, args.model, args.debug))
+        loop_factory = uvloop.new_event_loop if uvloop is not None else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            final_output = runner.run(_run_workflow(prompt, args.model, args.debug))
         if not final_output:
             print("Workflow completed without explicit output. Check DEBUG logs for details.")
         return 0
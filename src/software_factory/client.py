@@ -4,9 +4,8 @@ from __future__ import annotations
 
 import logging
 import os
-import sys
-from dataclasses import dataclass, field
-from functools import lru_cache
+from dataclasses import dataclass
+from functools import cache, lru_cache
 from typing import Any, Dict, Mapping, Optional
 
 from agent_framework.openai import OpenAIChatClient
@@ -18,23 +17,25 @@ class MissingAPIKeyError(RuntimeError):
 
 DEFAULT_MODEL_FALLBACK = "gpt-4o"
 _LOGGER = logging.getLogger(__name__)
-if not _LOGGER.handlers:
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(logging.Formatter("[software-factory] %(message)s"))
-    _LOGGER.addHandler(handler)
-_LOGGER.setLevel(logging.INFO)
-_LOGGER.propagate = False
+_LOGGER.addHandler(logging.NullHandler())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
     """Declarative capabilities per OpenAI chat model."""
 
     model_id: str
-    forced_parameters: Dict[str, Any] = field(default_factory=dict)
+    forced_parameters: tuple[tuple[str, Any], ...] = ()
     disallowed_parameters: frozenset[str] = frozenset()
 
     def apply(self, params: Mapping[str, Any] | None = None) -> Dict[str, Any]:
+        if not self.forced_parameters and not self.disallowed_parameters:
+            if not params:
+                return {}
+            if any(value is None for value in params.values()):
+                return {key: value for key, value in params.items() if value is not None}
+            return dict(params)
+
         base = params or {}
         sanitized = {
             key: value
@@ -48,11 +49,16 @@ class ModelConfig:
         return parameter not in self.disallowed_parameters
 
 
+# Reasoning models reject sampling controls; share one frozenset across their configs.
+_DISALLOW_SAMPLING = frozenset(("temperature", "top_p"))
+
 DEFAULT_MODEL_CONFIG = ModelConfig(model_id="default")
 MODEL_CONFIGS: Dict[str, ModelConfig] = {
     "gpt-4o": ModelConfig(model_id="gpt-4o"),
     "gpt-4.1": ModelConfig(model_id="gpt-4.1"),
-    "gpt-5-mini": ModelConfig(model_id="gpt-5-mini", disallowed_parameters=frozenset({"temperature","top_p"})),
+    "gpt-5": ModelConfig(model_id="gpt-5", disallowed_parameters=_DISALLOW_SAMPLING),
+    "gpt-5-mini": ModelConfig(model_id="gpt-5-mini", disallowed_parameters=_DISALLOW_SAMPLING),
+    "gpt-5-nano": ModelConfig(model_id="gpt-5-nano", disallowed_parameters=_DISALLOW_SAMPLING),
 }
 
 
@@ -65,19 +71,29 @@ def _require_api_key() -> str:
     return api_key
 
 
-@lru_cache(maxsize=4)
+# The set of models used in one process is small, so never evict a built client.
+@cache
 def _build_client(model_id: str) -> OpenAIChatClient:
     api_key = _require_api_key()
     _LOGGER.info("Initializing OpenAI chat client with model %s", model_id)
     return OpenAIChatClient(api_key=api_key, model_id=model_id)
 
 
+@lru_cache(maxsize=1)
+def _env_default_model() -> str:
+    return os.getenv("OPENAI_MODEL", DEFAULT_MODEL_FALLBACK)
+
+
+def invalidate_model_cache() -> None:
+    """Forget the cached OPENAI_MODEL default after the environment changes."""
+
+    _env_default_model.cache_clear()
+
+
 def _resolve_model_id(model_override: Optional[str]) -> str:
-    """Pick a model honoring runtime env overrides loaded after import."""
+    """Pick the override, else the OPENAI_MODEL default cached until invalidate_model_cache()."""
 
-    if model_override:
-        return model_override
-    return os.getenv("OPENAI_MODEL", DEFAULT_MODEL_FALLBACK)
+    return model_override or _env_default_model()
 
 
 def _build_model_config(
@@ -92,7 +108,11 @@ def _build_model_config(
         allowed = overrides.get("allow_parameters")
         if allowed:
             disallowed -= set(allowed)
-    return ModelConfig(model_id=model_id, forced_parameters=forced, disallowed_parameters=frozenset(disallowed))
+    return ModelConfig(
+        model_id=model_id,
+        forced_parameters=tuple(forced.items()),
+        disallowed_parameters=frozenset(disallowed),
+    )
 
 
 def get_model_config(
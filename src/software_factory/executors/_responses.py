@@ -0,0 +1,20 @@
+"""Helpers for turning agent responses into plain text or decoded JSON."""
+
+from typing import Any
+
+try:
+	from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional speedup
+	from json import loads as _json_loads
+
+
+def _response_to_text(response: Any) -> str:
+	text = getattr(response, "output_text", None)
+	if text:
+		return text
+	messages = getattr(response, "messages", None)
+	if messages:
+		content = getattr(messages[-1], "content", None)
+		if content is not None:
+			return str(content)
+	return "" if response is None else str(response)
@@ -1,6 +1,7 @@
 """Deterministic dispatcher that routes workflow control."""
 
-from typing import Any, Dict
+import io
+from typing import Callable, ClassVar, Dict, NamedTuple, Optional
 
 from agent_framework import Executor, handler
 from agent_framework._workflows._workflow_context import WorkflowContext
@@ -11,8 +12,21 @@ from ..signals import (
 	PLAN_CREATED,
 	REQUEST_VERIFICATION,
 	WORKFLOW_COMPLETE,
+	WorkflowMessage,
 )
-from ..state import ProjectState, Task, get_project_state, update_project_state
+from ..state import ProjectState, Task, state_transaction
+
+
+class _Routing(NamedTuple):
+	"""What the dispatcher emits once its state changes are persisted."""
+
+	message: Optional[WorkflowMessage] = None
+	output: Optional[str] = None
+
+
+_IDLE = _Routing()
+
+StatusHandler = Callable[["DispatcherExecutor", Task, ProjectState], _Routing]
 
 
 class DispatcherExecutor(Executor):
@@ -22,69 +36,70 @@ class DispatcherExecutor(Executor):
 		super().__init__(id=id)
 
 	@handler
-	async def handle(self, message: Dict[str, Any], ctx: WorkflowContext) -> None:
-		state = await get_project_state(ctx)
-		signal = (message or {}).get("signal")
-
-		if signal not in {PLAN_CREATED, ADVANCE_TASK}:
+	async def handle(self, message: WorkflowMessage, ctx: WorkflowContext) -> None:
+		if message.signal not in {PLAN_CREATED, ADVANCE_TASK}:
 			# Ignore unrelated noise but continue routing with current status.
 			pass
 
-		await self._route(state, ctx)
+		async with state_transaction(ctx) as state:
+			routing = self._route(state)
+		if routing.output is not None:
+			await ctx.yield_output(routing.output)
+		if routing.message is not None:
+			await ctx.send_message(routing.message)
 
-	async def _route(self, state: ProjectState, ctx: WorkflowContext) -> None:
+	def _route(self, state: ProjectState) -> _Routing:
 		if not state.tasks:
-			await ctx.yield_output("No tasks were planned; workflow exiting.")
-			await ctx.send_message({"signal": WORKFLOW_COMPLETE})
-			return
+			return _Routing(WorkflowMessage(WORKFLOW_COMPLETE), "No tasks were planned; workflow exiting.")
+
+		state.advance_past_completed()
 
 		if state.current_task_index >= len(state.tasks):
-			await self._finalize(state, ctx)
-			return
+			return self._finalize(state)
 
 		task = state.current_task()
 		if task is None:
-			await ctx.yield_output("State pointer is out of range; stopping execution.")
-			await ctx.send_message({"signal": WORKFLOW_COMPLETE})
-			return
-
-		match task.status:
-			case "pending" | "blocked":
-				await self._dispatch_task(ctx, state)
-			case "in_progress":
-				# Wait for the implementer to respond.
-				return
-			case "needs_review":
-				await ctx.send_message(
-					{"signal": REQUEST_VERIFICATION, "task_index": state.current_task_index}
-				)
-			case "completed":
-				state.current_task_index += 1
-				await update_project_state(ctx, state)
-				await self._route(state, ctx)
-			case _:
-				await ctx.yield_output(
-					f"Unknown task status '{task.status}'. Manual intervention required."
-				)
-
-	async def _dispatch_task(self, ctx: WorkflowContext, state: ProjectState) -> None:
-		task = state.current_task()
-		if not task:
-			return
-		task.status = "in_progress"
-		await update_project_state(ctx, state)
-		await ctx.send_message(
-			{
-				"signal": DISPATCH_TASK,
-				"task_index": state.current_task_index,
-				"assignee": task.assignee,
-			}
+			return _Routing(
+				WorkflowMessage(WORKFLOW_COMPLETE), "State pointer is out of range; stopping execution."
+			)
+
+		return self._handle_current(task, state)
+
+	def _handle_current(self, task: Task, state: ProjectState) -> _Routing:
+		status_handler = self._STATUS_HANDLERS.get(task.status, DispatcherExecutor._report_unknown_status)
+		return status_handler(self, task, state)
+
+	def _dispatch_task(self, task: Task, state: ProjectState) -> _Routing:
+		state.replace_task(state.current_task_index, status="in_progress")
+		return _Routing(
+			WorkflowMessage(DISPATCH_TASK, assignee=task.assignee, task_index=state.current_task_index)
 		)
 
-	async def _finalize(self, state: ProjectState, ctx: WorkflowContext) -> None:
+	def _await_implementer(self, task: Task, state: ProjectState) -> _Routing:
+		# Wait for the implementer to respond.
+		return _IDLE
+
+	def _request_verification(self, task: Task, state: ProjectState) -> _Routing:
+		return _Routing(WorkflowMessage(REQUEST_VERIFICATION, task_index=state.current_task_index))
+
+	def _report_unknown_status(self, task: Task, state: ProjectState) -> _Routing:
+		return _Routing(output=f"Unknown task status '{task.status}'. Manual intervention required.")
+
+	def _finalize(self, state: ProjectState) -> _Routing:
 		if not state.final_artifact:
-			outputs = [task.output for task in state.tasks if task.output]
-			state.final_artifact = "\n\n".join(outputs) if outputs else "Workflow completed."
-			await update_project_state(ctx, state)
-		await ctx.yield_output(state.final_artifact or "Workflow completed.")
-		await ctx.send_message({"signal": WORKFLOW_COMPLETE})
+			buffer = io.StringIO()
+			for task in state.tasks:
+				if not task.output:
+					continue
+				if buffer.tell():
+					buffer.write("\n\n")
+				buffer.write(task.output)
+			state.final_artifact = buffer.getvalue() or "Workflow completed."
+		return _Routing(WorkflowMessage(WORKFLOW_COMPLETE), state.final_artifact or "Workflow completed.")
+
+	_STATUS_HANDLERS: ClassVar[Dict[str, StatusHandler]] = {
+		"pending": _dispatch_task,
+		"blocked": _dispatch_task,
+		"in_progress": _await_implementer,
+		"needs_review": _request_verification,
+	}
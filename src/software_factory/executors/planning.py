@@ -1,6 +1,5 @@
 """Planning executor implementation."""
 
-import json
 from typing import Any, Dict, List, Literal
 
 from agent_framework import ChatAgent, Executor, handler
@@ -8,8 +7,16 @@ from agent_framework._workflows._workflow_context import WorkflowContext
 from pydantic import BaseModel
 
 from ..client import ModelConfig, apply_model_config
-from ..signals import PLAN_CREATED
-from ..state import ProjectState, Task, get_project_state, update_project_state
+from ..signals import PLAN_CREATED, WorkflowMessage
+from ..state import ProjectState, Task, state_transaction
+from ._responses import _json_loads, _response_to_text
+
+
+_PLAN_PROMPT = (
+    "Original request:\n{request}\n\n"
+    "Return JSON with a 'tasks' array using coder/researcher assignees."
+    " Existing tasks (if any): {historical}"
+)
 
 
 class PlannerTaskPayload(BaseModel):
@@ -54,28 +61,26 @@ class PlanningExecutor(Executor):
     @handler
     async def handle(self, message: Any, ctx: WorkflowContext) -> None:
         user_request = _message_to_text(message)
-        state = await get_project_state(ctx)
-        if not state.original_request:
-            state.original_request = user_request
+        async with state_transaction(ctx) as state:
+            if not state.original_request:
+                state.original_request = user_request
 
-        prompt = self._build_prompt(user_request, state)
-        response = await self.agent.run(prompt)
-        tasks = self._parse_tasks(response)
-        if not tasks:
-            raise ValueError("Planner returned no tasks; ensure instructions are correct.")
+            prompt = self._build_prompt(user_request, state)
+            response = await self.agent.run(prompt)
+            tasks = self._parse_tasks(response)
+            if not tasks:
+                raise ValueError("Planner returned no tasks; ensure instructions are correct.")
 
-        state.tasks = tasks
-        state.current_task_index = 0
-        await update_project_state(ctx, state)
-        await ctx.send_message({"signal": PLAN_CREATED})
+            state.tasks = tasks
+            state.current_task_index = 0
+        await ctx.send_message(WorkflowMessage(PLAN_CREATED))
 
     def _build_prompt(self, user_request: str, state: ProjectState) -> str:
-        historical = "" if not state.tasks else json.dumps([task.model_dump() for task in state.tasks])
-        return (
-            "Original request:\n"
-            f"{user_request}\n\n"
-            "Return JSON with a 'tasks' array using coder/researcher assignees."
-            f" Existing tasks (if any): {historical}"
+        return _PLAN_PROMPT.format_map(
+            {
+                "request": user_request,
+                "historical": state.tasks_json() if state.tasks else "",
+            }
         )
 
     def _parse_tasks(self, response: Any) -> List[Task]:
@@ -86,7 +91,7 @@ class PlanningExecutor(Executor):
             data = payload
         else:
             plan_text = _response_to_text(response)
-            data = json.loads(plan_text)
+            data = _json_loads(plan_text)
         raw_tasks = data.get("tasks", [])
         return [Task(**task) for task in raw_tasks]
 
@@ -100,16 +105,3 @@ def _message_to_text(message: Any) -> str:
     if content is None and hasattr(message, "text"):
         return str(message.text)
     return str(message)
-
-
-def _response_to_text(response: Any) -> str:
-    if response is None:
-        return ""
-    if hasattr(response, "output_text") and response.output_text:
-        return response.output_text
-    messages = getattr(response, "messages", None)
-    if messages:
-        last = messages[-1]
-        if hasattr(last, "content"):
-            return str(last.content)
-    return str(response)
@@ -1,9 +1,33 @@
-"""Workflow signal constants used for deterministic routing."""
-
-PLAN_CREATED = "plan_created"
-DISPATCH_TASK = "dispatch_task"
-IMPLEMENTATION_DONE = "implementation_done"
-REQUEST_VERIFICATION = "request_verification"
-VERIFICATION_COMPLETE = "verification_complete"
-WORKFLOW_COMPLETE = "workflow_complete"
-ADVANCE_TASK = "advance_task"
+"""Workflow signal constants and message payloads used for deterministic routing."""
+
+from enum import IntEnum
+from typing import NamedTuple, Optional
+
+
+class Signal(IntEnum):
+    """Control signals; members compare equal to their int values, so routing compares by equality."""
+
+    PLAN_CREATED = 0
+    DISPATCH_TASK = 1
+    IMPLEMENTATION_DONE = 2
+    REQUEST_VERIFICATION = 3
+    VERIFICATION_COMPLETE = 4
+    WORKFLOW_COMPLETE = 5
+    ADVANCE_TASK = 6
+
+
+PLAN_CREATED = Signal.PLAN_CREATED
+DISPATCH_TASK = Signal.DISPATCH_TASK
+IMPLEMENTATION_DONE = Signal.IMPLEMENTATION_DONE
+REQUEST_VERIFICATION = Signal.REQUEST_VERIFICATION
+VERIFICATION_COMPLETE = Signal.VERIFICATION_COMPLETE
+WORKFLOW_COMPLETE = Signal.WORKFLOW_COMPLETE
+ADVANCE_TASK = Signal.ADVANCE_TASK
+
+
+class WorkflowMessage(NamedTuple):
+    """Routing payload exchanged between executors along workflow edges."""
+
+    signal: Signal
+    assignee: Optional[str] = None
+    task_index: Optional[int] = None
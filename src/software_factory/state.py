@@ -1,67 +1,302 @@
 """Typed shared state modeled with Pydantic."""
 
-from typing import List, Literal, Optional
+import json
+from contextlib import asynccontextmanager
+from functools import cached_property
+from operator import is_
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
-from agent_framework._workflows._workflow_context import WorkflowContext
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, PrivateAttr
+
+if TYPE_CHECKING:
+    from agent_framework._workflows._workflow_context import WorkflowContext
 
 
 TaskStatus = Literal["pending", "in_progress", "needs_review", "completed", "blocked"]
 
 
-class Task(BaseModel):
+class _CachingModel(BaseModel):
+    """Base for models that memoize derived values in private attributes.
+
+    Pydantic compares private attributes in ``__eq__`` and carries them over in
+    ``model_copy``; both are overridden so memoized values never leak into either.
+    """
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in type(self).model_fields)
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False) -> Any:
+        copied = super().model_copy(deep=deep)
+        copied._reset_caches()
+        # Assign updates through __setattr__ so per-field invalidation still runs.
+        for name, value in (update or {}).items():
+            setattr(copied, name, value)
+        return copied
+
+    def _reset_caches(self) -> None:
+        """Forget every memoized value."""
+
+
+class Task(_CachingModel):
     """A unit of work the planner creates for downstream executors."""
 
-    title: str = Field(..., description="Human-readable identifier for the task.")
-    description: str = Field(..., description="Detailed work to be carried out.")
-    assignee: Literal["coder", "researcher"] = Field(
-        ..., description="Specialized implementation agent responsible for the task."
-    )
-    status: TaskStatus = Field("pending", description="Execution lifecycle status.")
-    output: Optional[str] = Field(
-        None, description="Artifact or summary produced by the implementation agent."
-    )
-    feedback: Optional[str] = Field(
-        None, description="Verifier feedback used for iteration when a task fails review."
-    )
-
-
-class ProjectState(BaseModel):
+    __field_docs__: ClassVar[Dict[str, str]] = {
+        "title": "Human-readable identifier for the task.",
+        "description": "Detailed work to be carried out.",
+        "assignee": "Specialized implementation agent responsible for the task.",
+        "status": "Execution lifecycle status.",
+        "output": "Artifact or summary produced by the implementation agent.",
+        "feedback": "Verifier feedback used for iteration when a task fails review.",
+    }
+
+    title: str
+    description: str
+    assignee: Literal["coder", "researcher"]
+    status: TaskStatus = "pending"
+    output: Optional[str] = None
+    feedback: Optional[str] = None
+
+    _dump_cache: Optional[Dict[str, Any]] = PrivateAttr(None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name.startswith("_"):
+            return
+        self._dump_cache = None
+        if name == "feedback":
+            self.__dict__.pop("feedback_block", None)
+
+    def cached_dump(self) -> Dict[str, Any]:
+        """Return the last model_dump(), recomputing only after a field changes.
+
+        The returned dict may be shared with other callers and must be treated as read-only.
+        """
+
+        if self._dump_cache is None:
+            self._dump_cache = self.model_dump()
+        return self._dump_cache
+
+    @cached_property
+    def feedback_block(self) -> str:
+        """Prompt section carrying verifier feedback, empty when there is none."""
+
+        return f"\nPrevious verifier feedback:\n{self.feedback}" if self.feedback else ""
+
+    def _reset_caches(self) -> None:
+        self._dump_cache = None
+        self.__dict__.pop("feedback_block", None)
+
+
+class ProjectState(_CachingModel):
     """Shared memory ledger passed between executors."""
 
-    original_request: str = Field(
-        "", description="The initial human request that kicked off the workflow."
-    )
-    tasks: List[Task] = Field(default_factory=list)
+    __field_docs__: ClassVar[Dict[str, str]] = {
+        "original_request": "The initial human request that kicked off the workflow.",
+    }
+
+    original_request: str = ""
+    tasks: Tuple[Task, ...] = ()
     current_task_index: int = 0
     final_artifact: Optional[str] = None
 
+    _tasks_json: Optional[Tuple[Tuple[Dict[str, Any], ...], str]] = PrivateAttr(None)
+    _scalars_dump: Optional[Dict[str, Any]] = PrivateAttr(None)
+    _cached_idx: int = PrivateAttr(-1)
+    _cached_task: Optional[Task] = PrivateAttr(None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "tasks" and not isinstance(value, tuple):
+            value = tuple(value)
+        super().__setattr__(name, value)
+        if name.startswith("_"):
+            return
+        if name == "tasks":
+            self._cached_idx = -1
+        else:
+            self._scalars_dump = None
+            if name == "current_task_index":
+                self._cached_idx = -1
+
     def current_task(self) -> Optional[Task]:
-        if 0 <= self.current_task_index < len(self.tasks):
-            return self.tasks[self.current_task_index]
+        index = self.current_task_index
+        if index == self._cached_idx:
+            return self._cached_task
+        if 0 <= index < len(self.tasks):
+            task = self.tasks[index]
+            # Only hits are cached so tasks appended later are still found.
+            self._cached_idx = index
+            self._cached_task = task
+            return task
         return None
 
+    def advance_past_completed(self) -> None:
+        """Move the pointer onto the first task that still needs work."""
+
+        tasks = self.tasks
+        index = self.current_task_index
+        while 0 <= index < len(tasks) and tasks[index].status == "completed":
+            index += 1
+        if index != self.current_task_index:
+            self.current_task_index = index
+
+    def replace_task(self, index: int, **changes: Any) -> Task:
+        """Swap in an updated copy of one task, leaving the others shared, and return it."""
+
+        tasks = self.tasks
+        task = Task.model_construct(**{**tasks[index].cached_dump(), **changes})
+        self.tasks = tasks[:index] + (task,) + tasks[index + 1 :]
+        return task
+
+    def tasks_json(self) -> str:
+        """Serialize the task list, reusing the last result while every task dump is unchanged."""
+
+        # Task.cached_dump() hands out a new dict after any field change, so identity
+        # comparison also catches tasks edited in place.
+        dumps = tuple(task.cached_dump() for task in self.tasks)
+        cached = self._tasks_json
+        if cached is not None and len(cached[0]) == len(dumps) and all(map(is_, cached[0], dumps)):
+            return cached[1]
+        encoded = json.dumps(dumps)
+        self._tasks_json = (dumps, encoded)
+        return encoded
+
+    def cached_dump(self) -> Dict[str, Any]:
+        """Dump the state, splicing cached per-task dumps into cached scalar fields."""
+
+        if self._scalars_dump is None:
+            self._scalars_dump = self.model_dump(exclude={"tasks"})
+        return {**self._scalars_dump, "tasks": tuple(task.cached_dump() for task in self.tasks)}
+
+    def _reset_caches(self) -> None:
+        self._tasks_json = None
+        self._scalars_dump = None
+        self._cached_idx = -1
+        self._cached_task = None
+
 
 PROJECT_STATE_KEY = "project_shared_memory"
 
 
-async def get_project_state(ctx: WorkflowContext) -> ProjectState:
+async def get_project_state(ctx: "WorkflowContext") -> ProjectState:
     """Load the shared state, falling back to an empty ledger."""
 
     try:
         raw_state = await ctx.get_shared_state(PROJECT_STATE_KEY)
     except KeyError:
-        state = ProjectState()
-        await ctx.set_shared_state(PROJECT_STATE_KEY, state.model_dump())
-        return state
+        # Nothing to persist yet; the first state write creates the key.
+        return ProjectState()
     if not raw_state:
         return ProjectState()
     if isinstance(raw_state, ProjectState):
         return raw_state
-    return ProjectState(**raw_state)
+    return _construct_state(raw_state)
+
+
+def _construct_state(raw_state: Dict[str, Any]) -> ProjectState:
+    """Rebuild state this workflow already validated and dumped, skipping validators."""
+
+    tasks = []
+    for raw_task in raw_state.get("tasks", ()):
+        task = Task.model_construct(**raw_task)
+        # A complete raw dict is exactly what cached_dump() would produce, so seed the cache.
+        if len(raw_task) == _TASK_FIELD_COUNT:
+            task._dump_cache = raw_task
+        tasks.append(task)
+    state = ProjectState.model_construct(**{**raw_state, "tasks": tuple(tasks)})
+    if len(raw_state) == _STATE_FIELD_COUNT:
+        state._scalars_dump = {key: value for key, value in raw_state.items() if key != "tasks"}
+    return state
+
 
+_TASK_FIELD_COUNT = len(Task.model_fields)
+_STATE_FIELD_COUNT = len(ProjectState.model_fields)
 
-async def update_project_state(ctx: WorkflowContext, state: ProjectState) -> None:
+
+async def update_project_state(ctx: "WorkflowContext", state: ProjectState) -> None:
     """Persist the shared state snapshot back into the workflow context."""
 
-    await ctx.set_shared_state(PROJECT_STATE_KEY, state.model_dump())
+    await ctx.set_shared_state(PROJECT_STATE_KEY, state.cached_dump())
+
+
+StatePatch = Dict[str, Any]
+
+
+def diff_state(old: Dict[str, Any], new: Dict[str, Any]) -> List[StatePatch]:
+    """List the top-level fields and individual tasks that differ between two dumps."""
+
+    patches: List[StatePatch] = []
+    for key, value in new.items():
+        if key == "tasks":
+            continue
+        if key not in old or old[key] != value:
+            patches.append({"path": (key,), "value": value})
+
+    old_tasks = old.get("tasks", [])
+    new_tasks = new.get("tasks", [])
+    if len(old_tasks) != len(new_tasks):
+        patches.append({"path": ("tasks",), "value": new_tasks})
+        return patches
+    for index, (old_task, new_task) in enumerate(zip(old_tasks, new_tasks)):
+        if old_task is not new_task and old_task != new_task:
+            patches.append({"path": ("tasks", index), "value": new_task})
+    return patches
+
+
+def apply_patches(raw_state: Dict[str, Any], patches: List[StatePatch]) -> Dict[str, Any]:
+    """Apply patches copy-on-write, leaving the input dict and untouched subtrees shared."""
+
+    patched = dict(raw_state)
+    tasks: Optional[List[Any]] = None
+    for patch in patches:
+        path = patch["path"]
+        if len(path) == 1:
+            patched[path[0]] = patch["value"]
+            if path[0] == "tasks":
+                tasks = None
+            continue
+        if tasks is None:
+            tasks = list(patched.get("tasks", ()))
+        tasks[path[1]] = patch["value"]
+    if tasks is not None:
+        patched["tasks"] = tuple(tasks)
+    return patched
+
+
+async def patch_project_state(ctx: "WorkflowContext", patches: List[StatePatch]) -> None:
+    """Write only the changed parts of the shared state back into the workflow context."""
+
+    try:
+        raw_state = await ctx.get_shared_state(PROJECT_STATE_KEY)
+    except KeyError:
+        raw_state = None
+    if isinstance(raw_state, ProjectState):
+        raw_state = raw_state.cached_dump()
+    elif not raw_state:
+        # First write: patch the empty ledger readers started from so every field is stored.
+        raw_state = ProjectState().cached_dump()
+    await ctx.set_shared_state(PROJECT_STATE_KEY, apply_patches(raw_state, patches))
+
+
+@asynccontextmanager
+async def state_transaction(ctx: "WorkflowContext") -> AsyncIterator[ProjectState]:
+    """Load the shared state once and persist only what changed on clean exit."""
+
+    state = await get_project_state(ctx)
+    before = state.cached_dump()
+    yield state
+    patches = diff_state(before, state.cached_dump())
+    if patches:
+        await patch_project_state(ctx, patches)
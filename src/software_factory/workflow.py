@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from agent_framework import WorkflowBuilder
 
@@ -11,41 +11,55 @@ from .executors.dispatcher import DispatcherExecutor
 from .executors.implementation import ImplementationExecutor
 from .executors.planning import PlanningExecutor
 from .executors.verification import VerificationExecutor
-from .signals import DISPATCH_TASK, REQUEST_VERIFICATION
+from .signals import DISPATCH_TASK, REQUEST_VERIFICATION, Signal, WorkflowMessage
 
 
 def build_workflow(chat_client, model_config: ModelConfig | None = None) -> Any:
 	"""Construct the Planner -> Dispatcher -> Implementers -> Verifier workflow."""
 
-	planner = PlanningExecutor(chat_client, model_config=model_config)
-	dispatcher = DispatcherExecutor()
-	coder = ImplementationExecutor(chat_client, role="coder", model_config=model_config)
-	researcher = ImplementationExecutor(chat_client, role="researcher", model_config=model_config)
-	verifier = VerificationExecutor(chat_client, model_config=model_config)
+	executors = {
+		"planner": PlanningExecutor(chat_client, model_config=model_config),
+		"dispatcher": DispatcherExecutor(),
+		"coder": ImplementationExecutor(chat_client, role="coder", model_config=model_config),
+		"researcher": ImplementationExecutor(chat_client, role="researcher", model_config=model_config),
+		"verifier": VerificationExecutor(chat_client, model_config=model_config),
+	}
 
 	builder = WorkflowBuilder()
-	builder.set_start_executor(planner)
-	builder.add_edge(planner, dispatcher)
-	builder.add_edge(dispatcher, coder, condition=_assignee_condition("coder"))
-	builder.add_edge(dispatcher, researcher, condition=_assignee_condition("researcher"))
-	builder.add_edge(dispatcher, verifier, condition=_verification_condition)
-	builder.add_edge(coder, dispatcher)
-	builder.add_edge(researcher, dispatcher)
-	builder.add_edge(verifier, dispatcher)
+	builder.set_start_executor(executors["planner"])
+	for source, target in _EDGE_SPECS:
+		builder.add_edge(executors[source], executors[target])
+	builder.add_multi_selection_edge_group(
+		executors["dispatcher"],
+		[executors[kind] for kind in _DISPATCH_TARGETS],
+		_select_dispatch_targets,
+	)
 
 	return builder.build()
 
 
-def _assignee_condition(target: str) -> Callable[[Dict[str, Any]], bool]:
-	def _condition(message: Dict[str, Any]) -> bool:
-		return (
-			isinstance(message, dict)
-			and message.get("signal") == DISPATCH_TASK
-			and message.get("assignee") == target
-		)
+# The graph topology never varies between builds; only the executors are recreated.
+_EDGE_SPECS: Tuple[Tuple[str, str], ...] = (
+	("planner", "dispatcher"),
+	("coder", "dispatcher"),
+	("researcher", "dispatcher"),
+	("verifier", "dispatcher"),
+)
 
-	return _condition
+# Dispatcher fan-out targets; _ROUTES values index into this tuple.
+_DISPATCH_TARGETS: Tuple[str, ...] = ("coder", "researcher", "verifier")
 
+_ROUTES: Dict[Tuple[Signal, Optional[str]], int] = {
+	(DISPATCH_TASK, "coder"): 0,
+	(DISPATCH_TASK, "researcher"): 1,
+	(REQUEST_VERIFICATION, None): 2,
+}
 
-def _verification_condition(message: Dict[str, Any]) -> bool:
-	return isinstance(message, dict) and message.get("signal") == REQUEST_VERIFICATION
+
+def _select_dispatch_targets(message: Any, target_ids: List[str]) -> List[str]:
+	"""Pick the dispatcher's recipient with one table lookup instead of a predicate per edge."""
+
+	if type(message) is not WorkflowMessage:
+		return []
+	index = _ROUTES.get((message.signal, message.assignee))
+	return [] if index is None else [target_ids[index]]
@@ -0,0 +1,46 @@
+"""Shared fixtures for the software factory tests."""
+
+import pytest
+
+from software_factory.state import ProjectState
+
+
+class FakeWorkflowContext:
+    """In-memory stand-in for the WorkflowContext calls the executors make.
+
+    ``raw`` is what the shared-state key holds: a ProjectState is stored as its
+    sparse dump, any other payload is stored as given, and ``None`` means the key
+    was never written, so reads raise KeyError like the framework does.
+    """
+
+    def __init__(self, raw=None):
+        if isinstance(raw, ProjectState):
+            raw = raw.model_dump(exclude_defaults=True, exclude_none=True)
+        self._shared_state = raw
+        self.sent_messages = []
+        self.outputs = []
+        self.state_writes = 0
+        self.writes_at_send = []
+
+    async def get_shared_state(self, key: str):
+        if self._shared_state is None:
+            raise KeyError(key)
+        return self._shared_state
+
+    async def set_shared_state(self, _key: str, value):
+        self._shared_state = value
+        self.state_writes += 1
+
+    async def send_message(self, payload):
+        self.sent_messages.append(payload)
+        self.writes_at_send.append(self.state_writes)
+
+    async def yield_output(self, output):
+        self.outputs.append(output)
+
+
+@pytest.fixture
+def make_context():
+    """Build a FakeWorkflowContext around a state, a raw payload, or nothing."""
+
+    return FakeWorkflowContext
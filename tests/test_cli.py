@@ -0,0 +1,83 @@
+"""CLI helper tests covering .env loading and event handling."""
+
+import os
+
+from agent_framework._workflows._events import WorkflowOutputEvent
+
+from software_factory.cli import _load_env_file, _lookup_handler, _on_output
+
+
+def test_load_env_file_parses_common_forms(tmp_path, monkeypatch) -> None:
+    for key in ("SF_PLAIN", "SF_EXPORTED", "SF_DOUBLE", "SF_SINGLE", "SF_COMMENTED", "SF_HASH", "SF_EMPTY"):
+        monkeypatch.delenv(key, raising=False)
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "# comment line\n"
+        "SF_PLAIN=value\n"
+        "export SF_EXPORTED = exported\n"
+        'SF_DOUBLE="quoted # kept"\n'
+        "SF_SINGLE='single'\n"
+        "SF_COMMENTED=bare # trailing comment\n"
+        "SF_HASH=abc#123\n"
+        "SF_EMPTY=\n"
+        "#SF_IGNORED=1\n"
+        "not a pair\n",
+        encoding="utf-8",
+    )
+
+    _load_env_file(env_file)
+
+    assert os.environ["SF_PLAIN"] == "value"
+    assert os.environ["SF_EXPORTED"] == "exported"
+    assert os.environ["SF_DOUBLE"] == "quoted # kept"
+    assert os.environ["SF_SINGLE"] == "single"
+    assert os.environ["SF_COMMENTED"] == "bare"
+    assert os.environ["SF_HASH"] == "abc#123"
+    assert os.environ["SF_EMPTY"] == ""
+    assert "SF_IGNORED" not in os.environ
+
+
+def test_load_env_file_keeps_existing_variables(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("SF_EXISTING", "from-shell")
+    env_file = tmp_path / ".env"
+    env_file.write_text("SF_EXISTING=from-file\n", encoding="utf-8")
+
+    _load_env_file(env_file)
+
+    assert os.environ["SF_EXISTING"] == "from-shell"
+
+
+def test_load_env_file_ignores_missing_file(tmp_path) -> None:
+    _load_env_file(tmp_path / "missing.env")
+
+
+def test_load_env_file_ignores_empty_file(tmp_path) -> None:
+    env_file = tmp_path / ".env"
+    env_file.touch()
+
+    _load_env_file(env_file)
+
+
+def test_lookup_handler_memoizes_subclass_fallback() -> None:
+    class Base:
+        pass
+
+    class Child(Base):
+        pass
+
+    def handle_base(_event):
+        return "base"
+
+    table = {Base: handle_base}
+
+    assert _lookup_handler(table, Child, None) is handle_base
+    assert table[Child] is handle_base
+    assert _lookup_handler(table, int, None) is None
+    assert int in table
+
+
+def test_on_output_writes_executor_banner(capsys) -> None:
+    event = WorkflowOutputEvent(data="artifact", source_executor_id="dispatcher")
+
+    assert _on_output(event) == "artifact"
+    assert capsys.readouterr().out == "[workflow-output:dispatcher]\nartifact\n\n"
@@ -0,0 +1,34 @@
+"""Model configuration tests."""
+
+from software_factory.client import MODEL_CONFIGS, get_model_config, invalidate_model_cache
+
+
+def test_model_default_refreshes_after_invalidation(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4.1")
+    invalidate_model_cache()
+    assert get_model_config().model_id == "gpt-4.1"
+
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-5-mini")
+    assert get_model_config().model_id == "gpt-4.1"
+
+    invalidate_model_cache()
+    assert get_model_config().model_id == "gpt-5-mini"
+    invalidate_model_cache()
+
+
+def test_overrides_merge_into_forced_parameters() -> None:
+    config = get_model_config(
+        "gpt-5-mini",
+        overrides={"forced_parameters": {"max_tokens": 128}, "allow_parameters": ["top_p"]},
+    )
+
+    assert config.forced_parameters == (("max_tokens", 128),)
+    assert config.apply({"temperature": 0.3, "top_p": 0.9}) == {"top_p": 0.9, "max_tokens": 128}
+
+
+def test_unrestricted_config_only_drops_none_values() -> None:
+    config = MODEL_CONFIGS["gpt-4o"]
+
+    assert config.apply(None) == {}
+    assert config.apply({"temperature": 0.2}) == {"temperature": 0.2}
+    assert config.apply({"temperature": 0.2, "seed": None}) == {"temperature": 0.2}
@@ -7,64 +7,107 @@ from software_factory.signals import (
     ADVANCE_TASK,
     DISPATCH_TASK,
     PLAN_CREATED,
+    REQUEST_VERIFICATION,
     WORKFLOW_COMPLETE,
+    WorkflowMessage,
 )
 from software_factory.state import ProjectState, Task
 
 
-class _FakeContext:
-    def __init__(self, state: ProjectState):
-        self._shared_state = state.model_dump()
-        self.sent_messages = []
-        self.outputs = []
+def test_dispatcher_routes_pending_task(make_context) -> None:
+    state = ProjectState(
+        original_request="Ship feature",
+        tasks=(Task(title="Implement", description="Write code", assignee="coder"),),
+    )
+    dispatcher = DispatcherExecutor()
+    ctx = make_context(state)
 
-    async def get_shared_state(self, _key: str):
-        return self._shared_state
+    asyncio.run(dispatcher.handle(WorkflowMessage(PLAN_CREATED), ctx))
 
-    async def set_shared_state(self, _key: str, value):
-        self._shared_state = value
+    assert ctx.sent_messages, "Dispatcher did not emit a dispatch message."
+    dispatch = ctx.sent_messages[-1]
+    assert dispatch.signal == DISPATCH_TASK
+    assert dispatch.assignee == "coder"
+    assert ctx.writes_at_send == [1], "Dispatch was sent before the state change was persisted."
 
-    async def send_message(self, payload):
-        self.sent_messages.append(payload)
 
-    async def yield_output(self, output):
-        self.outputs.append(output)
+def test_dispatcher_finalizes_workflow(make_context) -> None:
+    state = ProjectState(
+        original_request="Ship feature",
+        tasks=(
+            Task(
+                title="Implement",
+                description="Write code",
+                assignee="coder",
+                status="completed",
+                output="result",
+            ),
+        ),
+        current_task_index=1,
+    )
+    dispatcher = DispatcherExecutor()
+    ctx = make_context(state)
 
+    asyncio.run(dispatcher.handle(WorkflowMessage(ADVANCE_TASK), ctx))
 
-def test_dispatcher_routes_pending_task() -> None:
+    assert ctx.outputs, "Dispatcher did not emit a final artifact."
+    assert ctx.sent_messages[-1].signal == WORKFLOW_COMPLETE
+
+
+def test_dispatcher_skips_completed_tasks_with_single_write(make_context) -> None:
     state = ProjectState(
         original_request="Ship feature",
-        tasks=[Task(title="Implement", description="Write code", assignee="coder")],
+        tasks=(
+            Task(title="Research", description="Survey", assignee="researcher", status="completed"),
+            Task(title="Design", description="Sketch", assignee="researcher", status="completed"),
+            Task(title="Implement", description="Write code", assignee="coder"),
+        ),
     )
     dispatcher = DispatcherExecutor()
-    ctx = _FakeContext(state)
+    ctx = make_context(state)
 
-    asyncio.run(dispatcher.handle({"signal": PLAN_CREATED}, ctx))
+    asyncio.run(dispatcher.handle(WorkflowMessage(ADVANCE_TASK), ctx))
 
-    assert ctx.sent_messages, "Dispatcher did not emit a dispatch message."
-    dispatch = ctx.sent_messages[-1]
-    assert dispatch["signal"] == DISPATCH_TASK
-    assert dispatch["assignee"] == "coder"
+    assert ctx._shared_state["current_task_index"] == 2
+    assert ctx.sent_messages[-1].signal == DISPATCH_TASK
+    assert ctx.sent_messages[-1].assignee == "coder"
+    assert ctx.state_writes == 1
 
 
-def test_dispatcher_finalizes_workflow() -> None:
+def test_dispatcher_requests_verification_for_review(make_context) -> None:
     state = ProjectState(
         original_request="Ship feature",
-        tasks=[
+        tasks=(
             Task(
                 title="Implement",
                 description="Write code",
                 assignee="coder",
-                status="completed",
+                status="needs_review",
                 output="result",
-            )
-        ],
-        current_task_index=1,
+            ),
+        ),
     )
     dispatcher = DispatcherExecutor()
-    ctx = _FakeContext(state)
+    ctx = make_context(state)
 
-    asyncio.run(dispatcher.handle({"signal": ADVANCE_TASK}, ctx))
+    asyncio.run(dispatcher.handle(WorkflowMessage(ADVANCE_TASK), ctx))
 
-    assert ctx.outputs, "Dispatcher did not emit a final artifact."
-    assert ctx.sent_messages[-1]["signal"] == WORKFLOW_COMPLETE
+    assert ctx.sent_messages[-1] == WorkflowMessage(REQUEST_VERIFICATION, task_index=0)
+
+
+def test_dispatcher_joins_task_outputs_into_artifact(make_context) -> None:
+    state = ProjectState(
+        original_request="Ship feature",
+        tasks=(
+            Task(title="Research", description="Survey", assignee="researcher", status="completed", output="notes"),
+            Task(title="Review", description="Check", assignee="researcher", status="completed"),
+            Task(title="Implement", description="Write code", assignee="coder", status="completed", output="code"),
+        ),
+    )
+    dispatcher = DispatcherExecutor()
+    ctx = make_context(state)
+
+    asyncio.run(dispatcher.handle(WorkflowMessage(ADVANCE_TASK), ctx))
+
+    assert ctx.outputs == ["notes\n\ncode"]
+    assert ctx._shared_state["final_artifact"] == "notes\n\ncode"
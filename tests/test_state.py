@@ -0,0 +1,173 @@
+"""Shared-state model tests."""
+
+import asyncio
+import json
+
+from software_factory.state import (
+    ProjectState,
+    Task,
+    apply_patches,
+    diff_state,
+    get_project_state,
+    state_transaction,
+)
+
+
+def _state() -> ProjectState:
+    return ProjectState(
+        original_request="Ship feature",
+        tasks=(Task(title="Implement", description="Write code", assignee="coder"),),
+    )
+
+
+def test_tasks_json_reuses_cached_encoding() -> None:
+    state = _state()
+
+    first = state.tasks_json()
+
+    assert json.loads(first)[0]["title"] == "Implement"
+    assert state.tasks_json() is first
+
+
+def test_tasks_json_refreshes_after_mutation() -> None:
+    state = _state()
+    state.tasks_json()
+
+    state.tasks[0].status = "completed"
+    assert json.loads(state.tasks_json())[0]["status"] == "completed"
+
+    state.tasks = [Task(title="Research", description="Survey", assignee="researcher")]
+    assert json.loads(state.tasks_json())[0]["title"] == "Research"
+
+
+def test_caches_stay_out_of_equality_and_copies() -> None:
+    state = _state()
+    state.tasks_json()
+    assert state == _state()
+
+    task = state.tasks[0]
+    assert task.model_copy(update={"status": "completed"}).cached_dump()["status"] == "completed"
+
+    research = Task(title="Research", description="Survey", assignee="researcher")
+    replanned = state.model_copy(update={"tasks": [research]})
+    assert json.loads(replanned.tasks_json())[0]["title"] == "Research"
+
+
+def test_feedback_block_tracks_feedback_updates() -> None:
+    task = Task(title="Implement", description="Write code", assignee="coder")
+    assert task.feedback_block == ""
+
+    task.feedback = "Add tests"
+    assert task.feedback_block == "\nPrevious verifier feedback:\nAdd tests"
+
+    task.feedback = None
+    assert task.feedback_block == ""
+    assert "feedback_block" not in task.model_dump()
+
+    task.feedback = "Add tests"
+    assert task.feedback_block
+    assert "feedback_block" not in task.model_copy().__dict__
+    assert task.model_copy(update={"feedback": None}).feedback_block == ""
+
+
+def test_get_project_state_round_trips_dumped_state(make_context) -> None:
+    original = _state()
+    original.tasks[0].feedback = "Add tests"
+
+    restored = asyncio.run(get_project_state(make_context(original)))
+
+    assert restored == original
+    assert restored.tasks[0].feedback_block == original.tasks[0].feedback_block
+    assert restored.tasks_json() == original.tasks_json()
+
+
+def test_cached_dump_tracks_field_changes() -> None:
+    state = _state()
+    state.tasks += (Task(title="Review", description="Check", assignee="researcher"),)
+    first = state.cached_dump()
+    assert first == state.model_dump()
+
+    state.tasks[1].status = "completed"
+    state.current_task_index = 1
+    second = state.cached_dump()
+
+    assert second == state.model_dump()
+    assert second["tasks"][0] is first["tasks"][0]
+    assert second["tasks"][1] is not first["tasks"][1]
+    assert state.model_copy(update={"final_artifact": "done"}).cached_dump()["final_artifact"] == "done"
+
+
+def test_diff_and_apply_patches_touch_only_changed_parts() -> None:
+    state = _state()
+    state.tasks += (Task(title="Review", description="Check", assignee="researcher"),)
+    before = state.cached_dump()
+
+    state.tasks[1].status = "in_progress"
+    state.current_task_index = 1
+    patches = diff_state(before, state.cached_dump())
+
+    assert [patch["path"] for patch in patches] == [("current_task_index",), ("tasks", 1)]
+    patched = apply_patches(before, patches)
+    assert patched == state.model_dump()
+    assert patched["tasks"][0] is before["tasks"][0]
+    assert before["tasks"][1]["status"] == "pending"
+
+
+def test_state_transaction_skips_write_without_changes(make_context) -> None:
+    async def _run(ctx, mutate):
+        async with state_transaction(ctx) as state:
+            mutate(state)
+
+    ctx = make_context(_state())
+    asyncio.run(_run(ctx, lambda state: state.current_task()))
+    assert ctx.state_writes == 0
+
+    asyncio.run(_run(ctx, lambda state: setattr(state.tasks[0], "status", "in_progress")))
+    assert ctx.state_writes == 1
+    assert ctx._shared_state["tasks"][0]["status"] == "in_progress"
+
+
+def test_state_transaction_first_write_stores_every_field(make_context) -> None:
+    async def _run(ctx):
+        async with state_transaction(ctx) as state:
+            state.original_request = "Ship feature"
+            state.tasks = _state().tasks
+
+    ctx = make_context()
+    asyncio.run(_run(ctx))
+
+    assert ctx.state_writes == 1
+    assert ctx._shared_state == _state().model_dump()
+
+
+def test_current_task_follows_pointer_and_task_changes() -> None:
+    state = _state()
+    first = state.current_task()
+    assert state.current_task() is first
+
+    state.current_task_index = 1
+    assert state.current_task() is None
+    state.tasks += (Task(title="Review", description="Check", assignee="researcher"),)
+    assert state.current_task().title == "Review"
+
+    state.tasks = (Task(title="Replan", description="Again", assignee="coder"),)
+    state.current_task_index = 0
+    assert state.current_task().title == "Replan"
+
+    copied = state.model_copy(deep=True)
+    assert copied == state
+    assert copied.current_task() is copied.tasks[0]
+
+
+def test_replace_task_swaps_one_task_copy_on_write() -> None:
+    state = _state()
+    state.tasks += (Task(title="Review", description="Check", assignee="researcher"),)
+    before = state.cached_dump()
+    original = state.tasks
+
+    updated = state.replace_task(1, status="in_progress", feedback="Retry")
+
+    assert original[1].status == "pending"
+    assert state.tasks[0] is original[0]
+    assert state.tasks[1] is updated and updated.feedback_block.endswith("Retry")
+    assert [patch["path"] for patch in diff_state(before, state.cached_dump())] == [("tasks", 1)]
@@ -0,0 +1,24 @@
+"""Routing tests for the workflow graph."""
+
+from software_factory.signals import (
+    DISPATCH_TASK,
+    REQUEST_VERIFICATION,
+    WORKFLOW_COMPLETE,
+    WorkflowMessage,
+)
+from software_factory.workflow import _select_dispatch_targets
+
+
+def test_dispatch_targets_route_by_signal_and_assignee() -> None:
+    targets = ["implementation_coder", "implementation_researcher", "verifier"]
+
+    def select(message):
+        return _select_dispatch_targets(message, targets)
+
+    assert select(WorkflowMessage(DISPATCH_TASK, assignee="coder", task_index=0)) == ["implementation_coder"]
+    assert select(WorkflowMessage(DISPATCH_TASK, assignee="researcher", task_index=0)) == [
+        "implementation_researcher"
+    ]
+    assert select(WorkflowMessage(REQUEST_VERIFICATION, task_index=0)) == ["verifier"]
+    assert select(WorkflowMessage(WORKFLOW_COMPLETE)) == []
+    assert select({"signal": DISPATCH_TASK, "assignee": "coder"}) == []